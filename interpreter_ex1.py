@@ -2,152 +2,161 @@
 Basic interpreter of expressions like "X+Y", "X-Y", "X*Y", "X/Y", where X and Y – integers.
 """
 
+import functools
 import operator
-from enum import Enum
+import re
+from collections.abc import Iterator
 
 
 class ParseError(Exception):
     pass
 
 
+# Token types. Plain ints rather than an Enum, so type comparisons are cheap int comparisons
+INTEGER, PLUS, MINUS, MULTIPLY, DIVIDE, EOF = range(6)
+_TYPE_NAMES = ("INTEGER", "PLUS", "MINUS", "MULTIPLY", "DIVIDE", "EOF")
+_INTEGER_TYPES = frozenset((INTEGER,))
+_BINOP_TYPES = frozenset((PLUS, MINUS, MULTIPLY, DIVIDE))
+_EOF_TYPES = frozenset((EOF,))
+# Token types accepted at each position of "X op Y" expression, see `Interpreter.expr`
+_EXPR_GRAMMAR = (_INTEGER_TYPES, _BINOP_TYPES, _INTEGER_TYPES, _EOF_TYPES)
+
+
 class Token:
-    class Type(str, Enum):
-        INTEGER = "INTEGER"
-        PLUS = "PLUS"
-        MINUS = "MINUS"
-        MULTIPLY = "MULTIPLY"
-        DIVIDE = "DIVIDE"
-        EOF = "EOF"
-
-        @staticmethod
-        def from_operation(char: str) -> "Token.Type":
-            symbol_to_type = {
-                "+": Token.Type.PLUS,
-                "-": Token.Type.MINUS,
-                "*": Token.Type.MULTIPLY,
-                "/": Token.Type.DIVIDE,
-            }
-            return symbol_to_type[char]
-
-    def __init__(self, type_: Type, value):
+    __slots__ = ("type_", "value", "pos")
+
+    def __init__(self, type_: int, value, pos: int):
         self.type_ = type_
         self.value = value
+        self.pos = pos  # index of the token's first symbol in the code, used in error messages
 
     def __str__(self):
-        return f"Token({self.type_}, {self.value})"
+        return f"Token({_TYPE_NAMES[self.type_]}, {self.value})"
+
+
+# Operation symbol to token type, indexed by the symbol's ASCII code (None for non-operations)
+_BYTE_TO_TYPE: list[int | None] = [None] * 128
+_BYTE_TO_TYPE[ord("+")] = PLUS
+_BYTE_TO_TYPE[ord("-")] = MINUS
+_BYTE_TO_TYPE[ord("*")] = MULTIPLY
+_BYTE_TO_TYPE[ord("/")] = DIVIDE
+
+# "Translate" operation token type to Python built-in operation
+_OP_DISPATCH = {
+    PLUS: operator.add,
+    MINUS: operator.sub,
+    MULTIPLY: operator.mul,
+    DIVIDE: operator.truediv,
+}
+
+# Optional leading whitespace, then either an integer (group 1) or an operation symbol (group 2).
+# Byte patterns: source is matched as ASCII, so `\d` / `\s` skip Unicode category lookups.
+_TOKEN_RE = re.compile(rb"\s*(?:(\d+)|([+\-*/]))")
+_WS_RE = re.compile(rb"\s*")
+# The whole "X op Y" expression in one match, for `eval_binop`
+_BINOP_RE = re.compile(rb"\s*(\d+)\s*([+\-*/])\s*(\d+)\s*")
 
 
 class Interpreter:
     def __init__(self, code: str):
         self.code = code  # code to interpret
-        self.pos = 0  # index into self.code
-        self.current_token: Token | None = None
-        self.current_char = self.code[self.pos]
+        self._n = len(code)  # EOF once self.pos reaches it
+        self.pos = 0  # index into self.code (and self._buf), used by lexer
+        try:
+            self._buf = code.encode("ascii")  # what the lexer actually scans
+        except UnicodeEncodeError as ex:
+            self.pos = ex.start
+            self._error()
+        # Whole code is lexed once, parser only walks the list
+        self.tokens: list[Token] = list(self._iter_tokens())
 
     def _error(self):
+        symbol = f"'{self.code[self.pos]}'" if self.pos < self._n else "end of code"
         raise ParseError(
             " " * (self.pos + 3) + "^\n"
-            f"Error parsing code at symbol {self.pos+1}: '{self.code[self.pos]}'"
+            f"Error parsing code at symbol {self.pos+1}: {symbol}"
         )
 
-    @property
-    def _eof(self) -> bool:
-        return self.pos > len(self.code) - 1
-
-    def _advance(self) -> None:
-        """Advance the `self.pos` pointer and set `self.current_char` property."""
-        self.pos += 1
-        if self._eof:
-            self.current_char = None  # Indicates EOF
-        else:
-            self.current_char = self.code[self.pos]
-
-    def _skip_whitespace(self):
-        while self.current_char is not None and self.current_char.isspace():
-            self._advance()
-
-    def _integer(self) -> int:
-        """Return a (multidigit) integer consumed from the code. Advances `pos` through the code."""
-        number = ""
-        while self.current_char is not None and self.current_char.isdigit():
-            number += self.current_char
-            self._advance()
-        return int(number)
-
-    def _is_operation(self) -> bool:
-        """Return true if current char represents an operation, i.e. '+-*/'."""
-        return self.current_char in ["+", "-", "*", "/"]
-
     def _get_next_token(self) -> Token:
         """
         Lexical analyzer (aka lexer, scanner or tokenizer).
-        Breaks sentence into tokens.
+        Breaks sentence into tokens, matching one token (with leading whitespace) per call with `_TOKEN_RE`.
         :return:
         """
-        while self.current_char is not None:
-            if self.current_char.isspace():
-                self._skip_whitespace()
-                continue
-
-            if self.current_char.isdigit():
-                return Token(Token.Type.INTEGER, self._integer())
-
-            # Try to parse operation
-            if self._is_operation():
-                operation = self.current_char
-                self._advance()
-                return Token(Token.Type.from_operation(operation), operation)
-
+        match = _TOKEN_RE.match(self._buf, self.pos)
+        if match is None:
+            # Not a token: either trailing whitespace before EOF, or an unknown symbol to report
+            self.pos = _WS_RE.match(self._buf, self.pos).end()
+            if self.pos >= self._n:
+                return Token(EOF, None, self.pos)
             self._error()
-        return Token(Token.Type.EOF, None)
 
-    def _eat(self, token_type: Token.Type | list[Token.Type]):
-        """
-        Compare the current token type with the passed token type and if they match then "eat" the current token
-        and assign the next token to the self.current_token, otherwise raise an exception.
-        """
-        if (
-            isinstance(token_type, Token.Type)
-            and self.current_token.type_ == token_type
-        ) or (isinstance(token_type, list) and self.current_token.type_ in token_type):
-            self.current_token = self._get_next_token()
-        else:
-            self._error()
+        self.pos = match.end()
+        if match.group(1) is not None:
+            return Token(INTEGER, int(match.group(1)), match.start(1))
+        # Operation is the last byte matched; indexing bytes gives its code point as int
+        operation = self._buf[self.pos - 1]
+        return Token(_BYTE_TO_TYPE[operation], chr(operation), self.pos - 1)
+
+    def _iter_tokens(self) -> Iterator[Token]:
+        """Yield all tokens of the code, up to and including EOF."""
+        while True:
+            token = self._get_next_token()
+            yield token
+            if token.type_ == EOF:
+                return
 
     def expr(self) -> int:
         """
         Try to parse and evaluate expression we know.
-        Expected structure to find: INTEGER -> PLUS | MINUS | MULTIPLY | DIVIDE -> INTEGER
+        Expected structure to find: INTEGER -> PLUS | MINUS | MULTIPLY | DIVIDE -> INTEGER -> EOF
+        The grammar is a fixed sequence, so tokens are checked against `_EXPR_GRAMMAR` position by position.
         :return: result of parsed expression
         """
-        # Parse the first token
-        self.current_token = self._get_next_token()
-
-        # Expect firtst digit
-        left = self.current_token
-        self._eat(Token.Type.INTEGER)
-
-        # Expect "+" | "-" | "*" | "/"
-        op = self.current_token
-        self._eat(
-            [Token.Type.PLUS, Token.Type.MINUS, Token.Type.MULTIPLY, Token.Type.DIVIDE]
-        )
-
-        # Expect second digit
-        right = self.current_token
-        self._eat(Token.Type.INTEGER)
-        # NB: After the last call, current_token is set to EOF
-
-        # "Translate" operation token type to Python built-in operation, and get the result
-        op_to_operator = {
-            Token.Type.PLUS: operator.add,
-            Token.Type.MINUS: operator.sub,
-            Token.Type.MULTIPLY: operator.mul,
-            Token.Type.DIVIDE: operator.truediv,
-        }
-        operation = op_to_operator[op.type_]
-        result = operation(left.value, right.value)
-        return result
+        # Token stream always ends with EOF, so a short one fails on it and a long one fails on the EOF slot
+        for token, allowed in zip(self.tokens, _EXPR_GRAMMAR):
+            if token.type_ not in allowed:
+                self.pos = token.pos
+                self._error()
+
+        left, op, right = self.tokens[:3]
+        return _OP_DISPATCH[op.type_](left.value, right.value)
+
+
+def eval_binop(expression: str) -> int | float:
+    """
+    Evaluate "X op Y" expression in one pass, without the Interpreter object and tokens.
+    Anything `_BINOP_RE` doesn't fully match is left to `Interpreter`, which gives the same result
+    or raises ParseError pointing at the bad symbol.
+    :return: result of parsed expression
+    """
+    match = _BINOP_RE.fullmatch(expression.encode("ascii", "replace"))
+    if match is None:
+        return Interpreter(expression).expr()
+    left, right = int(match.group(1)), int(match.group(3))
+    op = match.group(2)[0]
+    if op == 43:  # '+'
+        return left + right
+    elif op == 45:  # '-'
+        return left - right
+    elif op == 42:  # '*'
+        return left * right
+    else:  # '/'
+        return left / right
+
+
+@functools.lru_cache(maxsize=512)
+def _eval(expression: str) -> tuple[bool, int | float | str]:
+    """
+    Evaluate expression, memoizing the outcome by the raw input string.
+    ParseError is not cached as an exception but as an `(False, message)` pair, so repeated bad input
+    skips lexing as well.
+    :return: `(True, result)` on success, `(False, error message)` otherwise
+    """
+    try:
+        return True, eval_binop(expression)
+    except ParseError as ex:
+        return False, str(ex)
 
 
 if __name__ == "__main__":
@@ -155,7 +164,10 @@ if __name__ == "__main__":
         try:
             if not (expression := input(">> ")):
                 continue
-            print(Interpreter(expression).expr())
+            ok, value = _eval(expression)
+            if not ok:
+                raise ParseError(value)
+            print(value)
         except ParseError as ex:
             print(ex)
         except KeyboardInterrupt: